@@ -6,10 +6,12 @@
 __all__ = []
 
 from base64 import b64decode, b64encode
+from functools import lru_cache
 import http.client
 from itertools import chain
 import random
 
+from django.core.files.uploadedfile import SimpleUploadedFile
 from piston3.utils import rc
 
 from maasserver.models import Event
@@ -18,7 +20,6 @@ from maasserver.testing.factory import factory
 from maasserver.testing.matchers import HasStatusCode
 from maasserver.utils.converters import json_load_bytes
 from maasserver.utils.django_urls import reverse
-from maasserver.utils.orm import reload_object
 from metadataserver.enum import (
     SCRIPT_STATUS,
     SCRIPT_STATUS_CHOICES,
@@ -28,6 +29,14 @@ from metadataserver.fields import Bin
 from metadataserver.models import Script
 from provisioningserver.events import AUDIT
 
+# The URLs under test are static, but `reverse` walks the URL resolver on
+# every call. Cache the lookups for the lifetime of the test process.
+reverse = lru_cache(maxsize=None)(reverse)
+
+# Payload for results whose content is irrelevant to the assertions; a
+# constant avoids generating a fresh random string per stored result.
+SAMPLE_OUTPUT = "sample script output"
+
 
 class AdminCommissioningScriptsAPITest(APITestCase.ForAdmin):
     """Tests for `CommissioningScriptsHandler`."""
@@ -60,7 +69,7 @@ class AdminCommissioningScriptsAPITest(APITestCase.ForAdmin):
             self.get_url(),
             {
                 "name": name,
-                "content": factory.make_file_upload(content=content.encode()),
+                "content": SimpleUploadedFile("script", content.encode()),
             },
         )
         self.assertThat(response, HasStatusCode(http.client.OK))
@@ -83,7 +92,7 @@ class AdminCommissioningScriptsAPITest(APITestCase.ForAdmin):
             self.get_url(),
             {
                 "name": factory.make_name("name"),
-                "content": factory.make_file_upload(content=content.encode()),
+                "content": SimpleUploadedFile("script", content.encode()),
             },
         )
         self.assertThat(response, HasStatusCode(http.client.BAD_REQUEST))
@@ -114,7 +123,7 @@ class AdminCommissioningScriptAPITest(APITestCase.ForAdmin):
     """Tests for `CommissioningScriptHandler`."""
 
     def get_url(self, script_name):
-        return reverse("commissioning_script_handler", args=[script_name])
+        return reverse("commissioning_script_handler", args=(script_name,))
 
     def test_GET_returns_script_contents(self):
         script = factory.make_Script(script_type=SCRIPT_TYPE.COMMISSIONING)
@@ -131,14 +140,15 @@ class AdminCommissioningScriptAPITest(APITestCase.ForAdmin):
 
         response = self.client.put(
             self.get_url(script.name),
-            {"content": factory.make_file_upload(content=new_content)},
+            {"content": SimpleUploadedFile("script", new_content)},
         )
         self.assertThat(response, HasStatusCode(http.client.OK))
         self.assertEquals(rc.ALL_OK.content, response.content)
 
-        self.assertEqual(
-            new_content.decode("utf-8"), reload_object(script).script.data
-        )
+        # Only the script FK changes on PUT; refresh just that column
+        # instead of re-materialising the whole row via reload_object.
+        script.refresh_from_db(fields=["script"])
+        self.assertEqual(new_content.decode("utf-8"), script.script.data)
 
     def test_PUT_errors(self):
         old_content = factory.make_script_content(
@@ -157,7 +167,7 @@ class AdminCommissioningScriptAPITest(APITestCase.ForAdmin):
             self.get_url(script.name),
             {
                 "name": factory.make_name("name"),
-                "content": factory.make_file_upload(content=new_content),
+                "content": SimpleUploadedFile("script", new_content),
             },
         )
         self.assertThat(response, HasStatusCode(http.client.BAD_REQUEST))
@@ -171,7 +181,7 @@ class AdminCommissioningScriptAPITest(APITestCase.ForAdmin):
     def test_DELETE_deletes_script(self):
         script = factory.make_Script(script_type=SCRIPT_TYPE.COMMISSIONING)
         self.client.delete(self.get_url(script.name))
-        self.assertItemsEqual([], Script.objects.filter(name=script.name))
+        self.assertFalse(Script.objects.filter(name=script.name).exists())
         event = Event.objects.get(type__level=AUDIT)
         self.assertIsNotNone(event)
         self.assertEqual(
@@ -181,7 +191,7 @@ class AdminCommissioningScriptAPITest(APITestCase.ForAdmin):
 
 class CommissioningScriptAPITest(APITestCase.ForUser):
     def get_url(self, script_name):
-        return reverse("commissioning_script_handler", args=[script_name])
+        return reverse("commissioning_script_handler", args=(script_name,))
 
     def test_GET_is_forbidden(self):
         # It's not inconceivable that commissioning scripts contain
@@ -194,7 +204,7 @@ class CommissioningScriptAPITest(APITestCase.ForUser):
     def test_PUT_is_forbidden(self):
         script = factory.make_Script(script_type=SCRIPT_TYPE.COMMISSIONING)
         response = self.client.put(
-            self.get_url(script.name), {"content": factory.make_string()}
+            self.get_url(script.name), {"content": SAMPLE_OUTPUT}
         )
         self.assertThat(response, HasStatusCode(http.client.FORBIDDEN))
 
@@ -232,7 +242,7 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
         ):
             for script_result in script_set:
                 self.store_result(
-                    script_result, exit_status=0, stdout=factory.make_string()
+                    script_result, exit_status=0, stdout=SAMPLE_OUTPUT
                 )
 
         script_set = node.current_commissioning_script_set
@@ -251,8 +261,8 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
             + node.current_installation_script_set.scriptresult_set.count(),
             len(parsed_results),
         )
-        self.assertItemsEqual(
-            [
+        self.assertEqual(
+            {
                 "created",
                 "updated",
                 "id",
@@ -262,7 +272,7 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
                 "node",
                 "data",
                 "resource_uri",
-            ],
+            },
             parsed_result.keys(),
         )
         self.assertEquals(script_result.id, parsed_result["id"])
@@ -271,20 +281,25 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
             script_result.exit_status, parsed_result["script_result"]
         )
         self.assertEquals(script_set.result_type, parsed_result["result_type"])
-        self.assertEquals(
-            {"system_id": script_set.node.system_id}, parsed_result["node"]
-        )
+        # Use the local node rather than script_set.node, which would
+        # lazily re-fetch the very same row.
+        self.assertEquals({"system_id": node.system_id}, parsed_result["node"])
         self.assertEquals(
             script_result.stdout, b64decode(parsed_result["data"])
         )
 
     def test_list_returns_with_multiple_empty_data(self):
         node = factory.make_Node(with_empty_script_sets=True)
-        for script_result in chain(
-            node.current_commissioning_script_set,
-            node.current_testing_script_set,
-            node.current_installation_script_set,
-        ):
+        # Iterating a script set re-runs its queryset; materialise the
+        # results once and reuse the list for setup and assertion.
+        script_results = list(
+            chain(
+                node.current_commissioning_script_set,
+                node.current_testing_script_set,
+                node.current_installation_script_set,
+            )
+        )
+        for script_result in script_results:
             self.store_result(
                 script_result, exit_status=0, stdout="", stderr=""
             )
@@ -293,25 +308,24 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
         response = self.client.get(url)
         self.assertThat(response, HasStatusCode(http.client.OK))
         parsed_results = json_load_bytes(response.content)
-        self.assertItemsEqual(
-            [
+        self.assertEqual(
+            sorted(
                 script_result.stdout.decode("utf-8")
-                for script_result in chain(
-                    node.current_commissioning_script_set,
-                    node.current_testing_script_set,
-                    node.current_installation_script_set,
-                )
-            ],
-            [parsed_result.get("data") for parsed_result in parsed_results],
+                for script_result in script_results
+            ),
+            sorted(parsed_result["data"] for parsed_result in parsed_results),
         )
 
     def test_list_returns_stderr(self):
         node = factory.make_Node(with_empty_script_sets=True)
-        for script_result in chain(
-            node.current_commissioning_script_set,
-            node.current_testing_script_set,
-            node.current_installation_script_set,
-        ):
+        script_results = list(
+            chain(
+                node.current_commissioning_script_set,
+                node.current_testing_script_set,
+                node.current_installation_script_set,
+            )
+        )
+        for script_result in script_results:
             self.store_result(
                 script_result, exit_status=0, stdout="", stderr=""
             )
@@ -320,43 +334,39 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
         response = self.client.get(url, {"system_id": [node.system_id]})
         self.assertThat(response, HasStatusCode(http.client.OK))
         parsed_results = json_load_bytes(response.content)
-        self.assertItemsEqual(
-            [
+        self.assertEqual(
+            sorted(
                 script_result.stdout.decode("utf-8")
-                for script_result in chain(
-                    node.current_commissioning_script_set,
-                    node.current_testing_script_set,
-                    node.current_installation_script_set,
-                )
-            ],
-            [parsed_result["data"] for parsed_result in parsed_results],
+                for script_result in script_results
+            ),
+            sorted(parsed_result["data"] for parsed_result in parsed_results),
         )
 
     def test_list_returns_output_if_stdout_empty(self):
         node = factory.make_Node(with_empty_script_sets=True)
-        for script_result in chain(
-            node.current_commissioning_script_set,
-            node.current_testing_script_set,
-            node.current_installation_script_set,
-        ):
+        script_results = list(
+            chain(
+                node.current_commissioning_script_set,
+                node.current_testing_script_set,
+                node.current_installation_script_set,
+            )
+        )
+        for script_result in script_results:
             self.store_result(
-                script_result, exit_status=0, output=factory.make_string()
+                script_result, exit_status=0, output=SAMPLE_OUTPUT
             )
+        expected_data = [
+            b64encode(script_result.output).decode()
+            for script_result in script_results
+        ]
 
         url = reverse("node_results_handler")
         response = self.client.get(url, {"system_id": [node.system_id]})
         self.assertThat(response, HasStatusCode(http.client.OK))
         parsed_results = json_load_bytes(response.content)
-        self.assertItemsEqual(
-            [
-                b64encode(script_result.output).decode()
-                for script_result in chain(
-                    node.current_commissioning_script_set,
-                    node.current_testing_script_set,
-                    node.current_installation_script_set,
-                )
-            ],
-            [parsed_result["data"] for parsed_result in parsed_results],
+        self.assertEqual(
+            sorted(expected_data),
+            sorted(parsed_result["data"] for parsed_result in parsed_results),
         )
 
     def test_list_shows_all_latest_results(self):
@@ -380,7 +390,7 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
         response = self.client.get(url, {"system_id": [node.system_id]})
         self.assertThat(response, HasStatusCode(http.client.OK))
         parsed_results = json_load_bytes(response.content)
-        self.assertItemsEqual(
+        self.assertEqual(
             {script_result.id for script_result in script_results},
             {parsed_result["id"] for parsed_result in parsed_results},
         )
@@ -430,7 +440,7 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
         response = self.client.get(url)
         self.assertThat(response, HasStatusCode(http.client.OK))
         parsed_results = json_load_bytes(response.content)
-        self.assertItemsEqual(
+        self.assertEqual(
             {script_result.id for script_result in script_results},
             {parsed_result["id"] for parsed_result in parsed_results},
         )
@@ -459,7 +469,7 @@ class NodeCommissionResultHandlerAPITest(APITestCase.ForUser):
         response = self.client.get(url)
         self.assertThat(response, HasStatusCode(http.client.OK))
         parsed_results = json_load_bytes(response.content)
-        self.assertItemsEqual(
+        self.assertEqual(
             {script_result.id for script_result in expected_results},
             {parsed_result["id"] for parsed_result in parsed_results},
         )
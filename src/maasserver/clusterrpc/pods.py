@@ -5,7 +5,7 @@
 
 __all__ = ["discover_pod"]
 
-from twisted.internet.defer import DeferredList
+from twisted.internet.defer import DeferredList, DeferredSemaphore
 
 from maasserver.exceptions import PodProblem
 from maasserver.rpc import getAllClients
@@ -23,7 +23,9 @@ from provisioningserver.utils.twisted import (
 
 
 @asynchronous(timeout=FOREVER)
-def discover_pod(pod_type, context, pod_id=None, name=None, timeout=120):
+def discover_pod(
+    pod_type, context, pod_id=None, name=None, timeout=120, max_concurrency=32
+):
     """Discover a pod.
 
     :param pod_type: Type of pod to discover.
@@ -31,6 +33,8 @@ def discover_pod(pod_type, context, pod_id=None, name=None, timeout=120):
     :param pod_id: ID of the pod in the database (None if new pod).
     :param name: Name of the pod in the database (None if
         new pod).
+    :param max_concurrency: Maximum number of rack controllers queried
+        at the same time.
 
     :returns: Return a tuple with mapping of rack controller system_id and the
         discovered pod information and a mapping of rack controller
@@ -49,7 +53,11 @@ def discover_pod(pod_type, context, pod_id=None, name=None, timeout=120):
         )
 
     clients = getAllClients()
-    dl = DeferredList(map(discover, clients), consumeErrors=True)
+    semaphore = DeferredSemaphore(tokens=max_concurrency)
+    dl = DeferredList(
+        (semaphore.run(discover, client) for client in clients),
+        consumeErrors=True,
+    )
 
     def cb_results(results):
         discovered, failures = {}, {}
@@ -63,6 +71,18 @@ def discover_pod(pod_type, context, pod_id=None, name=None, timeout=120):
     return dl.addCallback(cb_results)
 
 
+# How much detail each exception type provides, for
+# `get_best_discovered_result`; higher ranks are raised in preference.
+_EXC_RANK = {PodActionFail: 3, NotImplementedError: 2, UnknownPodType: 1}
+
+
+def _exc_rank(exc):
+    """Return the rank of `exc`, honouring subclasses; 0 when unranked."""
+    return next(
+        (_EXC_RANK[cls] for cls in type(exc).__mro__ if cls in _EXC_RANK), 0
+    )
+
+
 def get_best_discovered_result(discovered):
     """Return the `DiscoveredPod` from `discovered` or raise an error
     if nothing was discovered or the best error return from the rack
@@ -73,18 +93,7 @@ def get_best_discovered_result(discovered):
         return list(discovered.values())[0]
     elif len(exceptions) > 0:
         # Raise the best exception that provides the most detail.
-        for exc_type in [
-            PodActionFail,
-            NotImplementedError,
-            UnknownPodType,
-            None,
-        ]:
-            for _, exc in exceptions.items():
-                if exc_type is not None:
-                    if isinstance(exc, exc_type):
-                        raise exc
-                else:
-                    raise exc
+        raise max(exceptions.values(), key=_exc_rank)
     else:
         return None
 
@@ -9,10 +9,10 @@ import random
 from unittest.mock import Mock, sentinel
 
 from crochet import wait_for
-from testtools.matchers import Equals, Is, IsInstance, MatchesAny, MatchesDict
 from twisted.internet import reactor
 from twisted.internet.defer import (
     CancelledError,
+    Deferred,
     fail,
     inlineCallbacks,
     succeed,
@@ -61,12 +61,10 @@ class TestDiscoverPod(MAASTransactionServerTestCase):
                 local_storage=random.randint(500, 1000),
             ),
         )
-        clients = []
-        for rack_id in rack_ids:
-            client = Mock()
-            client.ident = rack_id
-            client.return_value = succeed({"pod": pod})
-            clients.append(client)
+        clients = [
+            Mock(ident=rack_id, return_value=succeed({"pod": pod}))
+            for rack_id in rack_ids
+        ]
 
         self.patch(pods_module, "getAllClients").return_value = clients
         discovered = yield discover_pod(factory.make_name("pod"), {})
@@ -128,15 +126,50 @@ class TestDiscoverPod(MAASTransactionServerTestCase):
         discovered = yield discover_pod(
             factory.make_name("pod"), {}, timeout=0.5
         )
-        self.assertThat(discovered[0], Equals({}))
-        self.assertThat(
-            discovered[1], MatchesDict({rack_id: IsInstance(CancelledError)})
+        self.assertEqual({}, discovered[0])
+        self.assertEqual({rack_id}, set(discovered[1]))
+        self.assertIsInstance(discovered[1][rack_id], CancelledError)
+
+    @wait_for_reactor
+    @inlineCallbacks
+    def test__max_concurrency_bounds_in_flight_calls(self):
+        pod = DiscoveredPod(
+            architectures=["amd64/generic"],
+            cores=random.randint(1, 8),
+            cpu_speed=random.randint(1000, 3000),
+            memory=random.randint(1024, 4096),
+            local_storage=random.randint(500, 1000),
+            hints=DiscoveredPodHints(
+                cores=random.randint(1, 8),
+                cpu_speed=random.randint(1000, 3000),
+                memory=random.randint(1024, 4096),
+                local_storage=random.randint(500, 1000),
+            ),
+        )
+        first_result, second_result = Deferred(), Deferred()
+        clients = [
+            Mock(ident=factory.make_name("system_id"), return_value=deferred)
+            for deferred in (first_result, second_result)
+        ]
+
+        self.patch(pods_module, "getAllClients").return_value = clients
+        d = discover_pod(factory.make_name("pod"), {}, max_concurrency=1)
+        # Only the first client is queried while its call is still
+        # outstanding; the second waits on the semaphore.
+        self.assertEqual(1, clients[0].call_count)
+        self.assertEqual(0, clients[1].call_count)
+        first_result.callback({"pod": pod})
+        self.assertEqual(1, clients[1].call_count)
+        second_result.callback({"pod": pod})
+        discovered = yield d
+        self.assertEqual(
+            ({client.ident: pod for client in clients}, {}), discovered
         )
 
 
 class TestGetBestDiscoveredResult(MAASTestCase):
     def test_returns_one_of_the_discovered(self):
-        self.assertThat(
+        self.assertIn(
             get_best_discovered_result(
                 (
                     {
@@ -146,7 +179,7 @@ class TestGetBestDiscoveredResult(MAASTestCase):
                     {},
                 )
             ),
-            MatchesAny(Is(sentinel.first), Is(sentinel.second)),
+            {sentinel.first, sentinel.second},
         )
 
     def test_returns_None(self):
@@ -325,12 +325,17 @@ def make_hosts_for_subnets(subnets, nodes_dhcp_snippets: list = None):
     if nodes_dhcp_snippets is None:
         nodes_dhcp_snippets = []
 
+    # Render each snippet once and group them by node, instead of
+    # rescanning (and re-rendering) the full snippet list for every
+    # interface attached to an IP address.
+    snippets_by_node = defaultdict(list)
+    for dhcp_snippet in nodes_dhcp_snippets:
+        snippets_by_node[dhcp_snippet.node_id].append(
+            make_dhcp_snippet(dhcp_snippet)
+        )
+
     def get_dhcp_snippets_for_interface(interface):
-        dhcp_snippets = list()
-        for dhcp_snippet in nodes_dhcp_snippets:
-            if dhcp_snippet.node == interface.node:
-                dhcp_snippets.append(make_dhcp_snippet(dhcp_snippet))
-        return dhcp_snippets
+        return snippets_by_node.get(interface.node_id, [])
 
     sips = StaticIPAddress.objects.filter(
         alloc_type__in=[
@@ -352,6 +357,10 @@ def make_hosts_for_subnets(subnets, nodes_dhcp_snippets: list = None):
         if sip.temp_expires_on:
             continue
 
+        # The IP is the same for every host entry created from this
+        # address; render it once instead of per interface.
+        ip = str(sip.ip)
+
         # Add all interfaces attached to this IP address.
         for interface in sip.interface_set.order_by("id"):
             # Only allow an interface to be in hosts once.
@@ -372,7 +381,7 @@ def make_hosts_for_subnets(subnets, nodes_dhcp_snippets: list = None):
                             {
                                 "host": make_interface_hostname(parent),
                                 "mac": str(parent.mac_address),
-                                "ip": str(sip.ip),
+                                "ip": ip,
                                 "dhcp_snippets": get_dhcp_snippets_for_interface(
                                     parent
                                 ),
@@ -382,7 +391,7 @@ def make_hosts_for_subnets(subnets, nodes_dhcp_snippets: list = None):
                     {
                         "host": make_interface_hostname(interface),
                         "mac": str(interface.mac_address),
-                        "ip": str(sip.ip),
+                        "ip": ip,
                         "dhcp_snippets": get_dhcp_snippets_for_interface(
                             interface
                         ),
@@ -393,7 +402,7 @@ def make_hosts_for_subnets(subnets, nodes_dhcp_snippets: list = None):
                     {
                         "host": make_interface_hostname(interface),
                         "mac": str(interface.mac_address),
-                        "ip": str(sip.ip),
+                        "ip": ip,
                         "dhcp_snippets": get_dhcp_snippets_for_interface(
                             interface
                         ),